@@ -1,4 +1,5 @@
 import logging
+from itertools import groupby
 from typing import List
 
 from .settings import (
@@ -13,11 +14,10 @@ PRICE_CHEAP = "cheap"
 PRICE_NORMAL = "normal"
 PRICE_EXPENSIVE = "expensive"
 
+_PRICE_CATEGORY_INDEX = {PRICE_CHEAP: 0, PRICE_NORMAL: 1, PRICE_EXPENSIVE: 2}
 
-def _percentile(values: List[float], p: float) -> float:
-    if not values:
-        return 0.0
-    sorted_v = sorted(values)
+
+def _percentile_of_sorted(sorted_v: List[float], p: float) -> float:
     if p <= 0:
         return float(sorted_v[0])
     if p >= 100:
@@ -28,6 +28,15 @@ def _percentile(values: List[float], p: float) -> float:
     return float(sorted_v[lo] + (sorted_v[hi] - sorted_v[lo]) * (k - lo))
 
 
+def _p30_p80(values: List[float]) -> tuple[float, float]:
+    """Return (P30, P80) from a single sort of values."""
+    sorted_v = sorted(values)
+    return (
+        _percentile_of_sorted(sorted_v, PRICE_PERCENTILE_CHEAP),
+        _percentile_of_sorted(sorted_v, PRICE_PERCENTILE_EXPENSIVE),
+    )
+
+
 def classify_price(price: float, p30: float, p80: float) -> str:
     if p80 < ABSOLUTE_CHEAP_LIMIT:
         return PRICE_CHEAP
@@ -60,9 +69,7 @@ def compute_price_thresholds(
     )
     if not prices:
         return 0.0, 0.0
-    p30 = _percentile(prices, PRICE_PERCENTILE_CHEAP)
-    p80 = _percentile(prices, PRICE_PERCENTILE_EXPENSIVE)
-    return p30, p80
+    return _p30_p80(prices)
 
 
 async def async_get_price_thresholds(
@@ -76,8 +83,7 @@ async def async_get_price_thresholds(
     """
     if not current_prices:
         return 0.0, 0.0
-    p30 = _percentile(current_prices, PRICE_PERCENTILE_CHEAP)
-    p80 = _percentile(current_prices, PRICE_PERCENTILE_EXPENSIVE)
+    p30, p80 = _p30_p80(current_prices)
     _LOGGER.debug(
         "Price thresholds: P30=%.3f P80=%.3f (from %d today prices)",
         p30,
@@ -89,7 +95,7 @@ async def async_get_price_thresholds(
 
 def price_category_index(category: str) -> int:
     """Return numeric index for a price category (higher = more expensive)."""
-    return {PRICE_CHEAP: 0, PRICE_NORMAL: 1, PRICE_EXPENSIVE: 2}.get(category, 1)
+    return _PRICE_CATEGORY_INDEX.get(category, 1)
 
 
 def filter_short_peaks(
@@ -107,26 +113,13 @@ def filter_short_peaks(
     if min_slots <= 1:
         return list(categories)
 
-    result = list(categories)
-    index = 0
-    total = len(categories)
-
-    while index < total:
-        if categories[index] != PRICE_EXPENSIVE:
-            index += 1
-            continue
-
-        start = index
-        while index < total and categories[index] == PRICE_EXPENSIVE:
-            index += 1
-        end = index - 1
-        run_len = end - start + 1
-
-        if run_len < min_slots:
-            left = categories[start - 1] if start > 0 else PRICE_NORMAL
-            right = categories[end + 1] if end + 1 < total else PRICE_NORMAL
-            replacement = left if left != PRICE_EXPENSIVE else right
-            for i in range(start, end + 1):
-                result[i] = replacement
+    # groupby yields maximal runs, so the run before an expensive run is never
+    # expensive and result[-1] is always its original left neighbour.
+    result: List[str] = []
+    for category, run in groupby(categories):
+        run_len = len(list(run))
+        if category == PRICE_EXPENSIVE and run_len < min_slots:
+            category = result[-1] if result else PRICE_NORMAL
+        result.extend([category] * run_len)
 
     return result
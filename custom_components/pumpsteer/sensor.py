@@ -1,7 +1,7 @@
 import logging
 import math
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import homeassistant.util.dt as dt_util
 from homeassistant.components.sensor import SensorEntity
@@ -61,6 +61,9 @@ from .utils import (
     safe_float,
 )
 
+if TYPE_CHECKING:
+    from .forecast import ForecastPoint
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "pumpsteer"
@@ -88,6 +91,23 @@ _RESTORE_BRAKE_LAST_EXPENSIVE_T = "brake_last_expensive_t"
 # 60 s = one polling cycle → max ±5% per step at ramp_in/out = 20 min.
 _BRAKE_RAMP_MAX_DT_SECONDS: float = 60.0
 
+# ThermalOutlook analyses the next 24 h. The forecast is fetched once per cycle
+# with a horizon that covers both the outlook and the precool lookahead.
+_OUTLOOK_HORIZON_HOURS = 24
+_FORECAST_HORIZON_HOURS = max(PRECOOL_LOOKAHEAD, _OUTLOOK_HORIZON_HOURS)
+
+
+def _points_within(
+    points: List["ForecastPoint"], now: datetime, hours: int
+) -> List["ForecastPoint"]:
+    """Return the forecast points at most `hours` after now.
+
+    Filters on timestamp rather than position, since the merged forecast can
+    have gaps where neither weather nor price covers an hour.
+    """
+    end = now + timedelta(hours=hours)
+    return [p for p in points if p.timestamp <= end]
+
 
 class PumpSteerSensor(RestoreEntity):
     """
@@ -512,13 +532,15 @@ class PumpSteerSensor(RestoreEntity):
         interval_minutes: int,
         now: datetime,
     ) -> Optional[float]:
-        for index in range(1, len(categories) - current_slot):
-            if categories[current_slot + index] == PRICE_EXPENSIVE:
-                minutes_into_slot = now.minute % interval_minutes
-                minutes_left_in_slot = interval_minutes - minutes_into_slot
-                minutes_total = minutes_left_in_slot + (index - 1) * interval_minutes
-                return float(minutes_total)
-        return None
+        try:
+            next_expensive = categories.index(PRICE_EXPENSIVE, current_slot + 1)
+        except ValueError:
+            return None
+        index = next_expensive - current_slot
+        minutes_into_slot = now.minute % interval_minutes
+        minutes_left_in_slot = interval_minutes - minutes_into_slot
+        minutes_total = minutes_left_in_slot + (index - 1) * interval_minutes
+        return float(minutes_total)
 
     def _upcoming_expensive(
         self,
@@ -526,16 +548,18 @@ class PumpSteerSensor(RestoreEntity):
         current_slot: int,
         lookahead_slots: int,
     ) -> bool:
-        for index in range(
-            current_slot + 1,
-            min(len(categories), current_slot + lookahead_slots + 1),
-        ):
-            if categories[index] == PRICE_EXPENSIVE:
-                return True
-        return False
-
-    async def _forecast_temps(self) -> Optional[List[float]]:
-        cfg = self._cfg()
+        window = categories[current_slot + 1 : current_slot + lookahead_slots + 1]
+        return PRICE_EXPENSIVE in window
+
+    async def _fetch_forecast(
+        self, cfg: Dict[str, Any], now: datetime
+    ) -> Tuple[Optional[List["ForecastPoint"]], Optional[List[float]]]:
+        """Fetch the forecast once per cycle for both precool and ThermalOutlook.
+
+        Returns (points, temps). points is None when the forecast is not
+        configured or the fetch failed; temps is None when no usable outdoor
+        temperatures fall inside the precool lookahead.
+        """
         weather_entity = cfg.get("weather_entity")
         price_entity = cfg.get("electricity_price_entity")
 
@@ -550,7 +574,7 @@ class PumpSteerSensor(RestoreEntity):
                     ),
                 )
                 self._forecast_available_last = False
-            return None
+            return None, None
 
         from .forecast import async_build_forecast
 
@@ -559,15 +583,19 @@ class PumpSteerSensor(RestoreEntity):
                 self.hass,
                 price_entity_id=price_entity,
                 weather_entity_id=weather_entity,
-                horizon_hours=PRECOOL_LOOKAHEAD,
+                horizon_hours=_FORECAST_HORIZON_HOURS,
             )
         except Exception as err:
             if self._forecast_available_last is not False:
                 _LOGGER.debug("PumpSteer forecast build failed: %s", err)
                 self._forecast_available_last = False
-            return None
+            return None, None
 
-        temps = [p.outdoor_temp for p in points if p.outdoor_temp is not None]
+        temps = [
+            p.outdoor_temp
+            for p in _points_within(points, now, PRECOOL_LOOKAHEAD)
+            if p.outdoor_temp is not None
+        ]
         available_now = bool(temps)
 
         if available_now != self._forecast_available_last:
@@ -586,14 +614,15 @@ class PumpSteerSensor(RestoreEntity):
                 )
             self._forecast_available_last = available_now
 
-        return temps if temps else None
+        return points, (temps if temps else None)
 
     def _should_precool(
         self, summer_threshold: float, temps: Optional[List[float]]
     ) -> bool:
         if not temps:
             return False
-        return any(temp >= summer_threshold + PRECOOL_MARGIN for temp in temps)
+        threshold = summer_threshold + PRECOOL_MARGIN
+        return any(temp >= threshold for temp in temps)
 
     def _forecast_is_cold(
         self, summer_threshold: float, temps: Optional[List[float]], hours: int = 6
@@ -625,6 +654,14 @@ class PumpSteerSensor(RestoreEntity):
         heating_demand_c: float = 0.0,
     ) -> Dict[str, Any]:
         """Return standard attributes included in all modes."""
+        pi_result = self._last_pi_result
+        if pi_result is not None:
+            pi_error = round(pi_result.error, 3)
+            pi_p_term = round(pi_result.p_term, 3)
+            pi_i_term = round(pi_result.i_term, 3)
+        else:
+            pi_error = pi_p_term = pi_i_term = None
+
         return {
             "heating_demand_c": round(heating_demand_c, 2),
             "indoor_temperature": indoor,
@@ -634,21 +671,9 @@ class PumpSteerSensor(RestoreEntity):
             "aggressiveness": aggressiveness,
             "p30": round(self._p30, 3),
             "p80": round(self._p80, 3),
-            "pi_error_c": (
-                round(self._last_pi_result.error, 3)
-                if self._last_pi_result is not None
-                else None
-            ),
-            "pi_p_term": (
-                round(self._last_pi_result.p_term, 3)
-                if self._last_pi_result is not None
-                else None
-            ),
-            "pi_i_term": (
-                round(self._last_pi_result.i_term, 3)
-                if self._last_pi_result is not None
-                else None
-            ),
+            "pi_error_c": pi_error,
+            "pi_p_term": pi_p_term,
+            "pi_i_term": pi_i_term,
             "thermal_k": round(self._thermal_model.k, 4),
             "thermal_k_valid": self._thermal_model.is_valid,
             "thermal_k_samples": self._thermal_model.sample_count,
@@ -881,25 +906,17 @@ class PumpSteerSensor(RestoreEntity):
         ramp_out = max(RAMP_MIN_MINUTES, ramp_in * RAMP_OUT_FACTOR)
 
         comfort_floor = self._comfort_floor(target, aggressiveness)
-        forecast_temps = await self._forecast_temps()
+        forecast_points, forecast_temps = await self._fetch_forecast(cfg, now)
 
         # Compute ThermalOutlook for preheat gating (block 5b).
-        # Reuses the same weather entity already used by _forecast_temps.
+        # Reuses the forecast already fetched for precool above.
         self._last_outlook = None
-        _cfg_weather = cfg.get("weather_entity")
-        _cfg_price = cfg.get("electricity_price_entity")
-        if _cfg_weather and _cfg_price:
+        if forecast_points is not None:
             try:
-                from .forecast import async_build_forecast, analyze_thermal_outlook
+                from .forecast import analyze_thermal_outlook
 
-                _outlook_points = await async_build_forecast(
-                    self.hass,
-                    price_entity_id=_cfg_price,
-                    weather_entity_id=_cfg_weather,
-                    horizon_hours=24,
-                )
                 self._last_outlook = analyze_thermal_outlook(
-                    _outlook_points,
+                    _points_within(forecast_points, now, _OUTLOOK_HORIZON_HOURS),
                     summer_threshold=summer_threshold,
                 )
             except Exception as _err:
@@ -1368,11 +1385,15 @@ class PumpSteerSensor(RestoreEntity):
                 )
             return [], [], 60, 0
 
+        # Bind per-item helpers locally; both loops below run once per slot.
+        extract_price = PumpSteerSensor._extract_price
+        isfinite = math.isfinite
+
         prices: List[float] = []
         invalid_entries = 0
         for item in prices_raw:
-            value = PumpSteerSensor._extract_price(item)
-            if value is not None and math.isfinite(value):
+            value = extract_price(item)
+            if value is not None and isfinite(value):
                 prices.append(value)
             else:
                 invalid_entries += 1
@@ -1400,8 +1421,8 @@ class PumpSteerSensor(RestoreEntity):
 
         today_prices: List[float] = []
         for item in raw_today:
-            value = PumpSteerSensor._extract_price(item)
-            if value is not None and math.isfinite(value):
+            value = extract_price(item)
+            if value is not None and isfinite(value):
                 today_prices.append(value)
 
         # Cache price thresholds once per calendar day per entity.
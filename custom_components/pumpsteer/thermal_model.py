@@ -23,8 +23,8 @@ diagnostic/future-facing and not part of the active control path.
 from __future__ import annotations
 
 import logging
+import operator
 from collections import deque
-from dataclasses import dataclass
 from datetime import datetime
 from typing import Deque, Optional
 
@@ -59,15 +59,6 @@ _MIN_RATE_C_PER_HOUR = -5.0
 _MAX_RATE_C_PER_HOUR = 1.0
 
 
-@dataclass
-class ThermalSample:
-    """One data point collected during a braking period."""
-
-    indoor_temp: float
-    outdoor_temp: float
-    rate: float  # °C/h, negative when indoor temperature is falling
-
-
 class ThermalModel:
     """
     Estimate house cooling rate from braking-period samples.
@@ -93,8 +84,11 @@ class ThermalModel:
         self._valid: bool = False
         self._sample_count: int = 0
 
-        # Braking samples accumulated since the last fit cycle.
-        self._samples: list[ThermalSample] = []
+        # Braking samples accumulated since the last fit cycle, stored as
+        # parallel columns: the fit only needs delta_T and rate, so there is
+        # no per-sample object to allocate or dereference.
+        self._sample_deltas: list[float] = []  # indoor - outdoor, °C
+        self._sample_rates: list[float] = []  # °C/h, negative when cooling
 
         # Ring buffer of (timestamp, indoor_temp) used to estimate cooling rate.
         self._temp_history: Deque[tuple[datetime, float]] = deque(
@@ -121,7 +115,7 @@ class ThermalModel:
     @property
     def pending_samples(self) -> int:
         """Number of collected samples waiting for the next fit."""
-        return len(self._samples)
+        return len(self._sample_rates)
 
     # ── Persistence ────────────────────────────────────────────────────────────
 
@@ -188,13 +182,8 @@ class ThermalModel:
             # Too small a delta — measurement noise dominates.
             return
 
-        self._samples.append(
-            ThermalSample(
-                indoor_temp=indoor_temp,
-                outdoor_temp=outdoor_temp,
-                rate=rate,
-            )
-        )
+        self._sample_deltas.append(delta_t)
+        self._sample_rates.append(rate)
 
     def _compute_rate(self) -> Optional[float]:
         """
@@ -230,20 +219,17 @@ class ThermalModel:
         In PumpSteer 2.1.0, fitting improves diagnostics and observability.
         It does not by itself activate any control behavior.
         """
-        if len(self._samples) < _MIN_SAMPLES:
+        if len(self._sample_rates) < _MIN_SAMPLES:
             _LOGGER.debug(
                 "ThermalModel: only %d braking samples, keeping k=%.4f",
-                len(self._samples),
+                len(self._sample_rates),
                 self._k,
             )
             return
 
-        sum_xy = 0.0
-        sum_xx = 0.0
-        for sample in self._samples:
-            delta_t = sample.indoor_temp - sample.outdoor_temp
-            sum_xy += sample.rate * delta_t
-            sum_xx += delta_t**2
+        deltas = self._sample_deltas
+        sum_xy = sum(map(operator.mul, self._sample_rates, deltas))
+        sum_xx = sum(map(operator.mul, deltas, deltas))
 
         if sum_xx < 1e-6:
             _LOGGER.debug("ThermalModel: degenerate data, skipping fit")
@@ -254,7 +240,7 @@ class ThermalModel:
         if _K_MIN < k < _K_MAX:
             self._k = k
             self._valid = True
-            self._sample_count = len(self._samples)
+            self._sample_count = len(self._sample_rates)
             _LOGGER.debug(
                 "ThermalModel: fitted k=%.4f from %d samples",
                 k,
@@ -270,7 +256,8 @@ class ThermalModel:
             )
 
         # Clear samples after fit so a new learning window can begin.
-        self._samples.clear()
+        self._sample_deltas.clear()
+        self._sample_rates.clear()
 
     # ── Prediction helpers (diagnostic / future-facing) ───────────────────────
 
@@ -13,6 +13,11 @@ from .settings import MAX_REASONABLE_TEMP, MIN_REASONABLE_TEMP
 
 _LOGGER = logging.getLogger(__name__)
 
+# Built once; a set display containing names is rebuilt on every evaluation.
+_UNAVAILABLE_STATES = frozenset(
+    {STATE_UNAVAILABLE, STATE_UNKNOWN, "unavailable", "unknown", None}
+)
+
 
 def get_version() -> str:
     """Load integration version from manifest.json."""
@@ -74,13 +79,7 @@ def get_state(
     if not entity:
         _LOGGER.debug("Entity not found: %s", entity_id)
         return default
-    if entity.state in {
-        STATE_UNAVAILABLE,
-        STATE_UNKNOWN,
-        "unavailable",
-        "unknown",
-        None,
-    }:
+    if entity.state in _UNAVAILABLE_STATES:
         return default
     return entity.state
 
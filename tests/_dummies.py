@@ -0,0 +1,47 @@
+"""Delade testdubbletter för Home Assistant-objekt som sensorn läser från."""
+
+from types import SimpleNamespace
+
+
+def _to_state(v):
+    # Sensorn läser bara .state och .attributes från ett State-objekt.
+    if isinstance(v, dict):
+        return SimpleNamespace(
+            state=v.get("state", ""), attributes=v.get("attributes") or {}
+        )
+    return SimpleNamespace(state=v, attributes={})
+
+
+class DummyStates:
+    def __init__(self, mapping=None):
+        # Bygg state-objekten en gång; get() delar dem mellan anrop.
+        self._states = {
+            k: _to_state(v) for k, v in (mapping or {}).items() if v is not None
+        }
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+
+class DummyHass:
+    def __init__(self, states=None):
+        self.states = DummyStates(states or {})
+
+
+class DummyConfigEntry:
+    entry_id = "test"
+    data = {}
+    options = {}
+
+    def add_update_listener(self, listener):
+        pass
+
+
+def make_sensor(hass=None, state=None):
+    """Skapa en PumpSteerSensor mot testdubbletterna, ev. med startvärde."""
+    from custom_components.pumpsteer.sensor import PumpSteerSensor
+
+    sensor = PumpSteerSensor(hass or DummyHass(), DummyConfigEntry())
+    if state is not None:
+        sensor._state = state
+    return sensor
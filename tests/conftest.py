@@ -1,11 +1,43 @@
+import json
 import sys
 from pathlib import Path
 
-# Lägg till projektrot (/config)
-sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+import pytest
 
-# Lägg till pumpsteer-mappen
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Lös sökvägen en gång för hela testsessionen.
+TESTS_DIR = Path(__file__).resolve().parent
+
+# Projektroten är mappen som innehåller custom_components/: repo-roten, eller
+# HA-konfigmappen (/config) när tests/ ligger i den installerade integrationen
+# (/config/custom_components/pumpsteer/tests). pumpsteer-mappen själv läggs
+# inte till, eftersom dess datetime.py då skuggar standardbibliotekets.
+ROOT = (
+    TESTS_DIR.parent
+    if (TESTS_DIR.parent / "custom_components").is_dir()
+    else TESTS_DIR.parents[2]
+)
+sys.path.insert(0, str(ROOT))
+
+# Lägg till tests-mappen (för ha_test_stubs)
+sys.path.insert(0, str(TESTS_DIR))
 
 # 🔥 VIKTIGAST: ladda stubbar först
-import ha_test_stubs  # noqa: F401
+import ha_test_stubs  # noqa: E402, F401
+from _dummies import make_sensor  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def steer_sensor():
+    """Delad sensor för tester som bara anropar rena hjälpmetoder.
+
+    Tester som ändrar broms-, PI- eller tillståndsvärden ska skapa en egen
+    sensor via make_sensor().
+    """
+    return make_sensor()
+
+
+@pytest.fixture(scope="session")
+def manifest_version():
+    """Versionen i manifest.json, läst en gång per testsession."""
+    manifest = ROOT / "custom_components" / "pumpsteer" / "manifest.json"
+    return json.loads(manifest.read_text(encoding="utf-8"))["version"]
@@ -6,16 +6,10 @@ Updated for new architecture:
 - price categories no longer affect ramp computation
 """
 
-import sys
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _dummies import make_sensor
 
-import ha_test_stubs  # noqa: F401
-
-from custom_components.pumpsteer.sensor import PumpSteerSensor
 from custom_components.pumpsteer.settings import (
     RAMP_MAX_MINUTES,
     RAMP_MIN_MINUTES,
@@ -24,43 +18,6 @@ from custom_components.pumpsteer.settings import (
 # ── Helpers ────────────────────────────────────────────────────────────────
 
 
-class DummyState:
-    def __init__(self, state, attributes=None):
-        self.state = state
-        self.attributes = attributes or {}
-
-
-class DummyStates:
-    def __init__(self, mapping=None):
-        self._m = mapping or {}
-
-    def get(self, entity_id):
-        v = self._m.get(entity_id)
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return DummyState(v.get("state", ""), v.get("attributes", {}))
-        return DummyState(v)
-
-
-class DummyHass:
-    def __init__(self, states=None):
-        self.states = DummyStates(states or {})
-
-
-class DummyConfigEntry:
-    entry_id = "test"
-    data = {}
-    options = {}
-
-    def add_update_listener(self, listener):
-        pass
-
-
-def make_sensor() -> PumpSteerSensor:
-    return PumpSteerSensor(DummyHass(), DummyConfigEntry())
-
-
 def now_utc() -> datetime:
     return datetime.now(tz=timezone.utc)
 
@@ -70,44 +27,34 @@ def now_utc() -> datetime:
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def test_ramp_in_scales_with_house_inertia():
-    s = make_sensor()
-
-    low = s._compute_ramp_minutes(2.0)
-    high = s._compute_ramp_minutes(5.0)
+def test_ramp_in_scales_with_house_inertia(steer_sensor):
+    low = steer_sensor._compute_ramp_minutes(2.0)
+    high = steer_sensor._compute_ramp_minutes(5.0)
 
     assert high > low
 
 
-def test_ramp_in_clamped_to_min():
-    s = make_sensor()
-
-    ramp = s._compute_ramp_minutes(0.1)
+def test_ramp_in_clamped_to_min(steer_sensor):
+    ramp = steer_sensor._compute_ramp_minutes(0.1)
 
     assert ramp >= RAMP_MIN_MINUTES
 
 
-def test_ramp_in_clamped_to_max():
-    s = make_sensor()
-
-    ramp = s._compute_ramp_minutes(10.0)
+def test_ramp_in_clamped_to_max(steer_sensor):
+    ramp = steer_sensor._compute_ramp_minutes(10.0)
 
     assert ramp <= RAMP_MAX_MINUTES
 
 
-def test_ramp_in_deterministic():
-    s = make_sensor()
-
-    a = s._compute_ramp_minutes(3.0)
-    b = s._compute_ramp_minutes(3.0)
+def test_ramp_in_deterministic(steer_sensor):
+    a = steer_sensor._compute_ramp_minutes(3.0)
+    b = steer_sensor._compute_ramp_minutes(3.0)
 
     assert a == b
 
 
-def test_pre_brake_window_depends_on_ramp_only():
-    s = make_sensor()
-
-    ramp = s._compute_ramp_minutes(5.0)
+def test_pre_brake_window_depends_on_ramp_only(steer_sensor):
+    ramp = steer_sensor._compute_ramp_minutes(5.0)
     minutes_to_expensive = 45.0
 
     assert (minutes_to_expensive <= ramp) == (ramp >= 45.0)
@@ -10,14 +10,12 @@ Nya tester i denna version:
 Kör med: pytest tests/ -v
 """
 
-import sys
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
+from types import MappingProxyType
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-sys.path.insert(0, str(Path(__file__).resolve().parent))
+import pytest
 
-import ha_test_stubs  # noqa: F401 — måste importeras före alla HA-moduler
+from _dummies import DummyHass, make_sensor
 
 from custom_components.pumpsteer.electricity_price import (
     PRICE_CHEAP,
@@ -27,6 +25,7 @@ from custom_components.pumpsteer.electricity_price import (
     classify_price_list,
     compute_price_thresholds,
     filter_short_peaks,
+    price_category_index,
 )
 from custom_components.pumpsteer.settings import (
     ABSOLUTE_CHEAP_LIMIT,
@@ -40,65 +39,42 @@ from custom_components.pumpsteer.utils import (
     safe_float,
 )
 
-# ── Gemensamma test-hjälpklasser ──────────────────────────────────────────────
-
-
-class DummyState:
-    def __init__(self, state, attributes=None):
-        self.state = state
-        self.attributes = attributes or {}
-
-
-class DummyStates:
-    def __init__(self, mapping=None):
-        self._m = mapping or {}
-
-    def get(self, entity_id):
-        v = self._m.get(entity_id)
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return DummyState(v.get("state", ""), v.get("attributes", {}))
-        return DummyState(v)
-
-
-class DummyHass:
-    def __init__(self, states=None):
-        self.states = DummyStates(states or {})
-
-
-class DummyConfigEntry:
-    entry_id = "test"
-    data = {}
-    options = {}
-
-    def add_update_listener(self, listener):
-        pass
+# ── Gemensamma test-hjälpfunktioner ───────────────────────────────────────────
 
 
 def now_utc() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+# Gemensamma PI-indata: 2 °C under mål. Skrivskyddad så att inget test kan
+# ändra mallen för efterföljande tester.
+_PI_COLD_HOUSE = MappingProxyType(
+    {
+        "target_temp": 21.0,
+        "indoor_temp": 19.0,
+        "outdoor_temp": 5.0,
+        "aggressiveness": 1.0,
+    }
+)
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 # 1. Prisklassificering
 # ═════════════════════════════════════════════════════════════════════════════
 
 
-def test_classify_cheap_below_p30():
-    assert classify_price(0.5, p30=1.0, p80=2.0) == PRICE_CHEAP
-
-
-def test_classify_cheap_via_absolute_limit():
-    assert classify_price(ABSOLUTE_CHEAP_LIMIT - 0.01, p30=0.0, p80=0.0) == PRICE_CHEAP
-
-
-def test_classify_normal_between_p30_and_p80():
-    assert classify_price(1.5, p30=1.0, p80=2.0) == PRICE_NORMAL
-
-
-def test_classify_expensive_above_p80():
-    assert classify_price(2.5, p30=1.0, p80=2.0) == PRICE_EXPENSIVE
+@pytest.mark.parametrize(
+    ("price", "p30", "p80", "expected"),
+    [
+        (0.5, 1.0, 2.0, PRICE_CHEAP),
+        (ABSOLUTE_CHEAP_LIMIT - 0.01, 0.0, 0.0, PRICE_CHEAP),
+        (1.5, 1.0, 2.0, PRICE_NORMAL),
+        (2.5, 1.0, 2.0, PRICE_EXPENSIVE),
+    ],
+    ids=["below_p30", "absolute_limit", "between_p30_p80", "above_p80"],
+)
+def test_classify_price(price, p30, p80, expected):
+    assert classify_price(price, p30=p30, p80=p80) == expected
 
 
 def test_classify_price_list_length_preserved():
@@ -134,6 +110,14 @@ def test_classify_all_identical_prices_as_cheap():
     assert all(c == PRICE_CHEAP for c in cats)
 
 
+@pytest.mark.parametrize(
+    ("category", "expected"),
+    [(PRICE_CHEAP, 0), (PRICE_NORMAL, 1), (PRICE_EXPENSIVE, 2), ("okänd", 1)],
+)
+def test_price_category_index(category, expected):
+    assert price_category_index(category) == expected
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 # 2. filter_short_peaks
 # ═════════════════════════════════════════════════════════════════════════════
@@ -179,52 +163,39 @@ def test_filter_zero_interval_no_crash():
 # ═════════════════════════════════════════════════════════════════════════════
 
 
-def test_safe_float_normal():
-    assert safe_float("21.5") == 21.5
-
-
-def test_safe_float_none():
-    assert safe_float(None) is None
-
-
-def test_safe_float_unavailable():
-    assert safe_float("unavailable") is None
-
-
-def test_safe_float_unknown():
-    assert safe_float("unknown") is None
-
-
-def test_safe_float_below_min():
-    assert safe_float(-100.0, min_val=-50.0) is None
-
-
-def test_safe_float_above_max():
-    assert safe_float(100.0, max_val=50.0) is None
-
-
-def test_safe_float_nan():
-    assert safe_float(float("nan")) is None
-
-
-def test_safe_float_positive_inf():
-    assert safe_float(float("inf")) is None
-
-
-def test_safe_float_negative_inf():
-    assert safe_float(float("-inf")) is None
-
-
-def test_safe_float_nan_string():
-    assert safe_float("nan") is None
-
-
-def test_safe_float_integer():
-    assert safe_float(5) == 5.0
-
-
-def test_safe_float_zero():
-    assert safe_float(0.0) == 0.0
+@pytest.mark.parametrize(
+    ("value", "kwargs", "expected"),
+    [
+        ("21.5", {}, 21.5),
+        (5, {}, 5.0),
+        (0.0, {}, 0.0),
+        (None, {}, None),
+        ("unavailable", {}, None),
+        ("unknown", {}, None),
+        ("nan", {}, None),
+        (float("nan"), {}, None),
+        (float("inf"), {}, None),
+        (float("-inf"), {}, None),
+        (-100.0, {"min_val": -50.0}, None),
+        (100.0, {"max_val": 50.0}, None),
+    ],
+    ids=[
+        "normal",
+        "integer",
+        "zero",
+        "none",
+        "unavailable",
+        "unknown",
+        "nan_string",
+        "nan",
+        "positive_inf",
+        "negative_inf",
+        "below_min",
+        "above_max",
+    ],
+)
+def test_safe_float(value, kwargs, expected):
+    assert safe_float(value, **kwargs) == expected
 
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -268,20 +239,13 @@ def test_get_price_window_15min_intervals():
 # ═════════════════════════════════════════════════════════════════════════════
 
 
-def test_detect_interval_24_hourly():
-    assert detect_price_interval_minutes([1.0] * 24) == 60
-
-
-def test_detect_interval_96_quarter_hourly():
-    assert detect_price_interval_minutes([1.0] * 96) == 15
-
-
-def test_detect_interval_empty():
-    assert detect_price_interval_minutes([]) == 60
-
-
-def test_detect_interval_48_half_hourly():
-    assert detect_price_interval_minutes([1.0] * 48) == 30
+@pytest.mark.parametrize(
+    ("slots", "expected"),
+    [(24, 60), (96, 15), (48, 30), (0, 60)],
+    ids=["hourly", "quarter_hourly", "half_hourly", "empty"],
+)
+def test_detect_interval(slots, expected):
+    assert detect_price_interval_minutes([1.0] * slots) == expected
 
 
 def test_detect_interval_today_only_not_combined():
@@ -354,21 +318,27 @@ def test_comfort_floor_increases():
 # ═════════════════════════════════════════════════════════════════════════════
 
 
-def test_pi_heats_when_cold():
+@pytest.mark.parametrize(
+    ("indoor", "target"),
+    [(19.0, 21.0), (20.5, 21.0), (18.0, 21.0)],
+    ids=["two_below", "half_below", "clamped"],
+)
+def test_pi_heats_when_cold(indoor, target):
     from custom_components.pumpsteer.control import PIController
 
     pi = PIController()
     result = pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
+        target_temp=target,
+        indoor_temp=indoor,
         outdoor_temp=5.0,
         aggressiveness=1.0,
         update_time=now_utc(),
         kp=8.0,
         ki=0.0,
     )
-    assert result.offset < 0
-    assert result.error == 2.0
+    # Ren P-del: offset = -kp * fel, begränsad nedåt av output_clamp (20).
+    assert result.error == pytest.approx(target - indoor)
+    assert result.offset == pytest.approx(max(-20.0, -8.0 * (target - indoor)))
 
 
 def test_pi_zero_at_target():
@@ -409,10 +379,7 @@ def test_pi_integral_frozen_during_braking():
     pi = PIController()
     t = now_utc()
     pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
-        outdoor_temp=5.0,
-        aggressiveness=1.0,
+        **_PI_COLD_HOUSE,
         update_time=t,
         kp=0.0,
         ki=1.0,
@@ -420,10 +387,7 @@ def test_pi_integral_frozen_during_braking():
     )
     integral_before = pi._integral
     pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
-        outdoor_temp=5.0,
-        aggressiveness=1.0,
+        **_PI_COLD_HOUSE,
         update_time=t + timedelta(minutes=10),
         kp=0.0,
         ki=1.0,
@@ -439,10 +403,7 @@ def test_pi_integral_decays():
     pi = PIController()
     t = now_utc()
     pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
-        outdoor_temp=5.0,
-        aggressiveness=1.0,
+        **_PI_COLD_HOUSE,
         update_time=t,
         kp=0.0,
         ki=1.0,
@@ -450,10 +411,7 @@ def test_pi_integral_decays():
     )
     integral_before = pi._integral
     pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
-        outdoor_temp=5.0,
-        aggressiveness=1.0,
+        **_PI_COLD_HOUSE,
         update_time=t + timedelta(minutes=10),
         kp=0.0,
         ki=1.0,
@@ -506,10 +464,7 @@ def test_pi_all_zero_gains_no_crash():
 
     pi = PIController()
     result = pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
-        outdoor_temp=5.0,
-        aggressiveness=1.0,
+        **_PI_COLD_HOUSE,
         update_time=now_utc(),
         kp=0.0,
         ki=0.0,
@@ -524,9 +479,9 @@ def test_pi_all_zero_gains_no_crash():
 
 
 def test_safe_mode_passthrough():
-    from custom_components.pumpsteer.sensor import MODE_SAFE, PumpSteerSensor
+    from custom_components.pumpsteer.sensor import MODE_SAFE
 
-    s = PumpSteerSensor(DummyHass(), DummyConfigEntry())
+    s = make_sensor()
     s._enter_safe_mode("test", outdoor=5.0, now=now_utc())
     assert s._state == 5.0
     assert s._attributes["mode"] == MODE_SAFE
@@ -534,9 +489,9 @@ def test_safe_mode_passthrough():
 
 
 def test_safe_mode_no_outdoor():
-    from custom_components.pumpsteer.sensor import MODE_SAFE, PumpSteerSensor
+    from custom_components.pumpsteer.sensor import MODE_SAFE
 
-    s = PumpSteerSensor(DummyHass(), DummyConfigEntry())
+    s = make_sensor()
     s._enter_safe_mode("ingen ute", outdoor=None, now=now_utc())
     assert s._state is None
     assert s.available is False
@@ -544,9 +499,7 @@ def test_safe_mode_no_outdoor():
 
 
 def test_safe_mode_resets_pi_and_brake():
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
-
-    s = PumpSteerSensor(DummyHass(), DummyConfigEntry())
+    s = make_sensor()
     t = now_utc()
     s._brake_ramp = 1.0
     s._brake_last_t = t
@@ -559,9 +512,7 @@ def test_safe_mode_resets_pi_and_brake():
 
 
 def test_brake_hold_can_be_bypassed_for_immediate_release():
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
-
-    s = PumpSteerSensor(DummyHass(), DummyConfigEntry())
+    s = make_sensor()
     t0 = now_utc()
 
     engaged = s._update_brake_ramp(
@@ -584,19 +535,13 @@ def test_brake_hold_can_be_bypassed_for_immediate_release():
 
 
 def test_available_false_when_none():
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
-
-    s = PumpSteerSensor(DummyHass(), DummyConfigEntry())
+    s = make_sensor()
     s._state = None
     assert s.available is False
 
 
 def test_available_true_when_float():
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
-
-    s = PumpSteerSensor(DummyHass(), DummyConfigEntry())
-    s._state = 5.0
-    assert s.available is True
+    assert make_sensor(state=5.0).available is True
 
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -616,10 +561,7 @@ def test_pi_integral_reset_when_aggressiveness_zero():
 
     # Simulera att integralen byggts upp under en bromssession
     pi.compute(
-        target_temp=21.0,
-        indoor_temp=19.0,
-        outdoor_temp=5.0,
-        aggressiveness=1.0,
+        **_PI_COLD_HOUSE,
         update_time=t,
         kp=0.0,
         ki=1.0,
@@ -644,43 +586,156 @@ def test_preheat_on_missing_forecast_is_false_by_default():
     assert PREHEAT_ON_MISSING_FORECAST is False
 
 
-def test_forecast_is_cold_returns_false_when_no_forecast():
+def test_forecast_is_cold_returns_false_when_no_forecast(steer_sensor):
     """
     _forecast_is_cold ska returnera False (inte True) när temps=None,
     med PREHEAT_ON_MISSING_FORECAST=False (default).
     """
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
-
-    s = PumpSteerSensor(DummyHass({}), DummyConfigEntry())
-    result = s._forecast_is_cold(summer_threshold=18.0, temps=None, hours=6)
+    result = steer_sensor._forecast_is_cold(summer_threshold=18.0, temps=None, hours=6)
     assert result is False, (
         "_forecast_is_cold ska returnera False vid temps=None "
         "(PREHEAT_ON_MISSING_FORECAST=False)"
     )
 
 
-def test_forecast_is_cold_returns_true_when_cold_forecast():
-    """_forecast_is_cold ska returnera True när alla temps är under summer_threshold."""
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
+@pytest.mark.parametrize(
+    ("temps", "expected"),
+    [([5.0] * 6, True), ([22.0] * 6, False)],
+    ids=["cold", "warm"],
+)
+def test_forecast_is_cold_follows_forecast(steer_sensor, temps, expected):
+    """_forecast_is_cold ska vara True när alla temps är under summer_threshold."""
+    result = steer_sensor._forecast_is_cold(summer_threshold=18.0, temps=temps, hours=6)
+    assert result is expected
+
+
+@pytest.mark.parametrize(
+    ("temps", "expected"),
+    [
+        (None, False),
+        ([], False),
+        ([17.0, 19.0, 17.0], False),
+        ([17.0] * 6 + [21.0], True),
+        ([float("nan"), 25.0], True),
+    ],
+)
+def test_should_precool_on_warm_forecast(steer_sensor, temps, expected):
+    # Tröskel 18 °C + PRECOOL_MARGIN 3 °C → 21 °C krävs.
+    assert steer_sensor._should_precool(18.0, temps) is expected
+
+
+def _forecast_points(t0, hours):
+    from custom_components.pumpsteer.forecast import ForecastPoint
+
+    return [
+        ForecastPoint(
+            timestamp=t0 + timedelta(hours=h),
+            price=None,
+            outdoor_temp=float(h),
+            wind_speed=None,
+            wind_gust_speed=None,
+        )
+        for h in hours
+    ]
+
+
+def test_update_builds_forecast_once_for_precool_and_outlook(monkeypatch):
+    """En uppdateringscykel bygger prognosen en gång och delar den med ThermalOutlook."""
+    import asyncio
+
+    import homeassistant.util.dt as dt_util
+
+    from custom_components.pumpsteer import forecast
+    from custom_components.pumpsteer.sensor import _FORECAST_HORIZON_HOURS
+
+    calls = []
+
+    async def fake_build_forecast(hass, **kwargs):
+        calls.append(kwargs)
+        t0 = dt_util.now().replace(minute=0, second=0, microsecond=0)
+        return _forecast_points(t0, range(25))
+
+    monkeypatch.setattr(forecast, "async_build_forecast", fake_build_forecast)
+    hass = DummyHass(
+        {
+            "sensor.inne": "21",
+            "sensor.ute": "5",
+            "sensor.pris": {"state": "1", "attributes": {"today": [1.0] * 24}},
+        }
+    )
+    s = make_sensor(hass)
+    s._config_entry.data = {
+        "indoor_temp_entity": "sensor.inne",
+        "real_outdoor_entity": "sensor.ute",
+        "electricity_price_entity": "sensor.pris",
+        "weather_entity": "weather.home",
+    }
+
+    asyncio.run(s._do_update())
+
+    assert len(calls) == 1
+    assert calls[0]["horizon_hours"] == _FORECAST_HORIZON_HOURS
+    assert s._last_outlook is not None
+
+
+def test_fetch_forecast_limits_precool_temps_by_timestamp(monkeypatch):
+    """Precool-fönstret väljs på tidsstämpel, inte position, så luckor hanteras."""
+    import asyncio
+
+    from custom_components.pumpsteer import forecast
+    from custom_components.pumpsteer.settings import PRECOOL_LOOKAHEAD
+
+    t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    # Lucka mellan timme 10 och 30: positionellt skulle timme 30+ räknas in.
+    hours = [*range(11), *range(30, 48)]
 
-    s = PumpSteerSensor(DummyHass({}), DummyConfigEntry())
-    cold_temps = [5.0] * 6
-    result = s._forecast_is_cold(summer_threshold=18.0, temps=cold_temps, hours=6)
-    assert result is True
+    async def fake_build_forecast(hass, **kwargs):
+        return _forecast_points(t0, hours)
 
+    monkeypatch.setattr(forecast, "async_build_forecast", fake_build_forecast)
+    cfg = {"weather_entity": "weather.home", "electricity_price_entity": "sensor.p"}
+
+    points, temps = asyncio.run(make_sensor()._fetch_forecast(cfg, t0))
+
+    assert len(points) == len(hours)
+    assert temps == [float(h) for h in hours if h <= PRECOOL_LOOKAHEAD]
+
+
+def test_fetch_forecast_not_configured():
+    import asyncio
+
+    assert asyncio.run(make_sensor()._fetch_forecast({}, now_utc())) == (None, None)
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# 12. Kommande dyrperiod (_upcoming_expensive / _minutes_until_expensive)
+# ═════════════════════════════════════════════════════════════════════════════
+
+
+@pytest.mark.parametrize(
+    ("current_slot", "lookahead_slots", "expected"),
+    [(0, 2, False), (0, 3, True), (3, 5, False), (4, 5, False)],
+)
+def test_upcoming_expensive_window(
+    steer_sensor, current_slot, lookahead_slots, expected
+):
+    cats = [PRICE_NORMAL] * 3 + [PRICE_EXPENSIVE] + [PRICE_NORMAL]
+    assert (
+        steer_sensor._upcoming_expensive(cats, current_slot, lookahead_slots)
+        is expected
+    )
 
-def test_forecast_is_cold_returns_false_when_warm_forecast():
-    """_forecast_is_cold ska returnera False när temps är över summer_threshold."""
-    from custom_components.pumpsteer.sensor import PumpSteerSensor
 
-    s = PumpSteerSensor(DummyHass({}), DummyConfigEntry())
-    warm_temps = [22.0] * 6
-    result = s._forecast_is_cold(summer_threshold=18.0, temps=warm_temps, hours=6)
-    assert result is False
+def test_minutes_until_expensive_counts_from_slot_end(steer_sensor):
+    cats = [PRICE_NORMAL] * 3 + [PRICE_EXPENSIVE]
+    now = datetime(2025, 1, 1, 0, 20, tzinfo=timezone.utc)
+    # 40 min kvar av slot 0 + två hela timslottar innan slot 3.
+    assert steer_sensor._minutes_until_expensive(cats, 0, 60, now) == 160.0
+    assert steer_sensor._minutes_until_expensive(cats, 3, 60, now) is None
 
 
 # ═════════════════════════════════════════════════════════════════════════════
-# 12. Holiday sentinel-år
+# 13. Holiday sentinel-år
 # ═════════════════════════════════════════════════════════════════════════════
 
 
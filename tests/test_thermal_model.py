@@ -0,0 +1,41 @@
+"""Tests for thermal_model.py — braking sample collection and k fitting."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.pumpsteer.thermal_model import ThermalModel
+
+
+def _cooling_model(k: float, delta_t: float = 20.0, minutes: int = 30):
+    """Feed a model a steady cooling curve matching dT/dt = -k * delta_t."""
+    model = ThermalModel()
+    t0 = datetime(2025, 1, 1, 22, 0, tzinfo=timezone.utc)
+    rate = -k * delta_t  # °C/h
+    for minute in range(minutes):
+        indoor = 21.0 + rate * minute / 60.0
+        model.record_temp(t0 + timedelta(minutes=minute), indoor)
+        model.collect_braking_sample(indoor, indoor - delta_t)
+    return model
+
+
+def test_fit_recovers_k_from_braking_samples():
+    model = _cooling_model(k=0.05)
+    assert model.pending_samples >= 20
+
+    model.fit()
+
+    assert model.is_valid is True
+    assert model.k == pytest.approx(0.05)
+    assert model.pending_samples == 0
+
+
+def test_fit_keeps_fallback_with_too_few_samples():
+    model = _cooling_model(k=0.05, minutes=10)
+    fallback_k = model.k
+
+    model.fit()
+
+    assert model.is_valid is False
+    assert model.k == fallback_k
+    assert model.pending_samples > 0
@@ -9,9 +9,8 @@ from custom_components.pumpsteer.utils import (
 )
 
 
-def test_get_version_reads_manifest():
-    # FIX: uppdaterad till aktuell version i manifest.json
-    assert get_version() == "2.1.0"
+def test_get_version_reads_manifest(manifest_version):
+    assert get_version() == manifest_version
 
 
 def test_get_version_missing_manifest(monkeypatch):